@@ -1,6 +1,9 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import plotly.express as px
+import plotly.graph_objects as go
 
 # Set page configuration
 st.set_page_config(
@@ -11,45 +14,277 @@ st.set_page_config(
 
 # --- Helper Functions ---
 
-@st.cache_data
-def load_data(uploaded_file):
-    """Loads data from uploaded CSV or Excel file."""
-    if uploaded_file.name.endswith('.csv'):
-        # Added on_bad_lines='skip' for robustness
-        df = pd.read_csv(uploaded_file, on_bad_lines='skip') 
+def load_data(uploaded_file, excel_nrows=None):
+    """
+    Loads data from uploaded CSV, Excel or Parquet file into Arrow-backed dtypes where possible.
+    Excel files are read from the first sheet only, limited to excel_nrows rows when given.
+    """
+    if uploaded_file.name.endswith('.parquet'):
+        df = pd.read_parquet(uploaded_file, dtype_backend='pyarrow')
+    elif uploaded_file.name.endswith('.csv'):
+        # Added on_bad_lines='skip' for robustness; the pyarrow engine parses in parallel
+        df = pd.read_csv(uploaded_file, engine='pyarrow', dtype_backend='pyarrow', on_bad_lines='skip')
     else:
-        df = pd.read_excel(uploaded_file)
+        # calamine is a Rust-backed reader, much faster than openpyxl
+        df = pd.read_excel(uploaded_file, engine='calamine', sheet_name=0, nrows=excel_nrows)
+    return df
+
+def dtype_kind(dtype):
+    """
+    Returns the NumPy kind code of a dtype, mapping Arrow-backed date, decimal, string and dictionary types onto their NumPy equivalents.
+    String dtypes report kind 'U'; they are mapped to 'O' so they are treated like object string columns.
+    Other Arrow types (list, struct, map, binary, time, ...) return 'V' so they are left unclassified.
+    """
+    if isinstance(dtype, pd.StringDtype):
+        return 'O'
+    if isinstance(dtype, pd.ArrowDtype):
+        pa_type = dtype.pyarrow_dtype
+        if pa.types.is_timestamp(pa_type) or pa.types.is_date(pa_type):
+            return 'M'
+        if pa.types.is_decimal(pa_type):
+            return 'f'
+        if pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type) or pa.types.is_dictionary(pa_type):
+            return 'O'
+        if pa.types.is_integer(pa_type) or pa.types.is_floating(pa_type) or pa.types.is_boolean(pa_type) or pa.types.is_duration(pa_type):
+            return dtype.kind
+        # Nested and binary types report kind 'O' but Arrow's hash kernels can't handle them
+        return 'V'
+    return dtype.kind
+
+def infer_dates(df, sample_size=1000):
+    """
+    Converts object columns that look like dates to datetime.
+    Detection only parses the first sample_size non-null values; a column is converted when more than half of them parse.
+    Returns the converted frame and the list of converted column names.
+    """
+    df = df.copy(deep=False)
+    converted_columns = []
+    for col in df.columns:
+        dtype = df[col].dtype
+        # Only plain string columns are candidates; category dtypes also report kind 'O'
+        if dtype_kind(dtype) != 'O' or isinstance(dtype, pd.CategoricalDtype):
+            continue
+        sample = df[col].dropna().head(sample_size)
+        if sample.empty:
+            continue
+        # Try the fast ISO8601 path first, then fall back to pandas' format inference
+        for date_format in ('ISO8601', None):
+            try:
+                parsed = pd.to_datetime(sample, errors='coerce', format=date_format)
+                if parsed.notna().mean() <= 0.5:
+                    continue
+                # Rows beyond the sample can still fail, e.g. mixed UTC offsets leave an object column or raise
+                converted = pd.to_datetime(df[col], errors='coerce', format=date_format)
+            except (ValueError, TypeError):
+                continue
+            if dtype_kind(converted.dtype) == 'M':
+                df[col] = converted
+                converted_columns.append(col)
+            break
+    return df, converted_columns
+
+def downcast_columns(df, sample_size=10_000, max_unique_ratio=0.5):
+    """
+    Shrinks the frame's dtypes once after loading.
+    String columns (object or Arrow-backed) whose sampled unique ratio is below max_unique_ratio become category.
+    NumPy integer columns are downcast to the smallest fitting type; floats stay float64 so displayed values are not altered.
+    """
+    df = df.copy(deep=False)
+    for col in df.columns:
+        dtype = df[col].dtype
+        kind = dtype_kind(dtype)
+        if kind == 'O' and not isinstance(dtype, pd.CategoricalDtype):
+            sample = df[col].head(sample_size)
+            if len(sample) and sample.nunique() / len(sample) < max_unique_ratio:
+                df[col] = df[col].astype('category')
+        elif isinstance(dtype, np.dtype) and kind in ('i', 'u'):
+            df[col] = pd.to_numeric(df[col], downcast='integer' if kind == 'i' else 'unsigned')
     return df
 
+@st.cache_data
+def prepare_frame(uploaded_file, excel_nrows=None):
+    """
+    Loads the upload, converts date-like string columns and downcasts dtypes in one cached step.
+    Caching only the final frame keeps a single copy of the dataset in the cache.
+    Returns the prepared frame and the list of columns converted to datetime.
+    """
+    df = load_data(uploaded_file, excel_nrows)
+    df, converted_columns = infer_dates(df)
+    # Use category and smaller numeric dtypes to speed up group-bys and statistics
+    df = downcast_columns(df)
+    return df, converted_columns
+
+@st.cache_data
+def classify_columns(df):
+    """
+    Buckets columns into numeric, categorical and date lists from a single pass over the dtype kinds.
+    Category dtypes report kind 'O', so they land with the object and boolean columns.
+    """
+    columns = df.columns.to_numpy()
+    kinds = np.array([dtype_kind(dtype) for dtype in df.dtypes])
+    numeric_columns = columns[np.isin(kinds, list('iufc'))].tolist()
+    categorical_columns = columns[np.isin(kinds, list('ObU'))].tolist()
+    date_columns = columns[kinds == 'M'].tolist()
+    return numeric_columns, categorical_columns, date_columns
+
+@st.cache_data
+def prepare_plot_frame(df, max_points=50000, stratify_col=None):
+    """
+    Returns about max_points rows of df for plotting.
+    Samples proportionally within each group of stratify_col when given, keeping at least one row per group
+    so rare categories still appear; the result can exceed max_points by at most the number of groups.
+    """
+    if len(df) <= max_points:
+        return df
+    if stratify_col is None:
+        return df.sample(max_points, random_state=0)
+    frac = max_points / len(df)
+    # Missing values get their own stratum instead of being dropped or raising on NaN keys
+    positions = np.random.default_rng(0).permutation(len(df))
+    strata = df[stratify_col].astype(object).fillna('__nan__').iloc[positions].reset_index(drop=True)
+    grouped = strata.groupby(strata, sort=False)
+    # Take the first quota rows of each group in the shuffled order
+    quota = np.maximum(1, np.round(grouped.transform('size').to_numpy() * frac))
+    keep = grouped.cumcount().to_numpy() < quota
+    return df.iloc[np.sort(positions[keep])]
+
+@st.cache_data
+def prepare_time_series_frame(df, date_col, value_col, color_col=None):
+    """Builds a frame holding only the plotted columns, with date_col coerced to datetime."""
+    columns = [date_col, value_col] + ([color_col] if color_col else [])
+    return df[columns].assign(**{date_col: pd.to_datetime(df[date_col], errors='coerce')})
+
+@st.cache_data
+def compute_correlation(df, numeric_columns):
+    """
+    Computes the Pearson correlation matrix of numeric_columns on a float32 array with np.corrcoef.
+    Falls back to pandas' pairwise-complete DataFrame.corr() when the data contains NaNs.
+    """
+    arr = df[numeric_columns].to_numpy(dtype=np.float32, na_value=np.nan)
+    if np.isnan(arr).any():
+        return df[numeric_columns].corr()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # dtype keeps the computation in float32; np.cov would otherwise upcast to float64
+        corr = np.corrcoef(arr, rowvar=False, dtype=np.float32)
+    return pd.DataFrame(np.atleast_2d(corr), index=numeric_columns, columns=numeric_columns)
+
+@st.cache_data
+def describe_numeric(df, numeric_columns):
+    """Returns describe() for the numeric columns, memoized across reruns."""
+    return df[numeric_columns].describe()
+
+@st.cache_data
+def count_missing(df):
+    """Returns the per-column missing value counts for columns that have any, largest first."""
+    # Check each column with hasnans first so clean frames never build a full boolean mask
+    has_na = np.array([series.hasnans for _, series in df.items()], dtype=bool)
+    if not has_na.any():
+        return pd.Series(dtype='int64')
+    return df.loc[:, has_na].isna().sum().sort_values(ascending=False)
+
+@st.cache_data
+def summarize_categoricals(df, categorical_columns):
+    """Returns the unique count and most frequent value of each categorical column."""
+    # describe() computes unique count and most frequent value for all columns in one call
+    cat_stats = df[categorical_columns].describe(include='all').T.reindex(columns=['unique', 'top'])
+    cat_stats = cat_stats.rename(columns={'unique': 'Unique Values', 'top': 'Most Frequent Value'})
+    cat_stats['Most Frequent Value'] = cat_stats['Most Frequent Value'].fillna('N/A')
+    cat_stats.index.name = 'Column'
+    return cat_stats
+
+@st.cache_data
+def cached_value_counts(df, col):
+    """Returns value_counts() of a single column, memoized per (df, col)."""
+    return df[col].value_counts()
+
+@st.cache_data
+def cached_histogram(df, col, bins=50):
+    """Bins a numeric column server-side and returns (counts, edges) from np.histogram, ignoring missing and infinite values."""
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.histogram(values[np.isfinite(values)], bins=bins)
+
+@st.cache_data
+def rasterize_scatter(df, col_x, col_y, width=800, height=600):
+    """
+    Aggregates a scatter of col_x against col_y into a width x height grid of point counts with datashader.
+    Returns (counts, x_centers, y_centers) as NumPy arrays, or None when no finite points span a non-zero range.
+    """
+    x = df[col_x].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df[col_y].to_numpy(dtype=np.float64, na_value=np.nan)
+    # Non-finite values would make the autodetected canvas range infinite
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if not len(x) or x.min() == x.max() or y.min() == y.max():
+        return None
+    # Imported lazily: datashader pulls in numba and is only needed for very large scatters
+    import datashader as ds
+    points = pd.DataFrame({'x': x, 'y': y})
+    agg = ds.Canvas(plot_width=width, plot_height=height).points(points, 'x', 'y')
+    return agg.values, agg.coords['x'].values, agg.coords['y'].values
+
+@st.cache_data
+def aggregate_hierarchy(df, path_cols, value_col=None):
+    """
+    Collapses df to one row per distinct path for sunburst/treemap plots.
+    Sums value_col per path when given, otherwise counts rows into a '__count' column.
+    """
+    # observed=True avoids a cartesian product of unused categories
+    grouped = df.groupby(path_cols, observed=True, dropna=False)
+    if value_col is None:
+        return grouped.size().reset_index(name='__count')
+    return grouped[value_col].sum().reset_index()
+
+def to_plot_array(series):
+    """
+    Converts a column to a NumPy array Plotly can ship as a base64 typed array.
+    Integers that fit are downcast to int32; other numerics become float64, since float32 would round displayed values.
+    Non-numeric columns pass through.
+    """
+    kind = dtype_kind(series.dtype)
+    if kind in ('i', 'u') and not series.hasnans and series.min() >= -2**31 and series.max() < 2**31:
+        return series.to_numpy(dtype=np.int32)
+    if kind in ('i', 'u', 'f'):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return series.to_numpy()
+
+@st.cache_data
+def overview_bundle(df):
+    """Returns the preview rows, shape and column dtypes shown on the overview tab."""
+    return df.head(), df.shape, df.dtypes.astype(str).to_frame('dtype')
+
 def display_overview(df):
     """Displays the dataset overview (head, shape, dtypes)."""
     st.header("Dataset Overview")
     
+    preview, shape, dtypes = overview_bundle(df)
+    
     st.write("### First 5 rows")
-    st.dataframe(df.head())
+    st.dataframe(preview)
     
     st.write("### Dataset Shape")
-    st.write(f"Rows: {df.shape[0]}, Columns: {df.shape[1]}")
+    st.write(f"Rows: {shape[0]}, Columns: {shape[1]}")
     
     st.write("### Column Types")
-    st.dataframe(df.dtypes.astype(str))
+    st.dataframe(dtypes)
 
 def display_statistics(df):
     """Displays descriptive statistics and missing values, including categorical analysis."""
     st.header("Statistical Summary")
     
+    numeric_columns, categorical_columns, _ = classify_columns(df)
+    
     # Descriptive Statistics for Numeric Data
     st.write("### Descriptive Statistics (Numeric Data)")
-    numeric_df = df.select_dtypes(include=['float64', 'int64'])
-    if not numeric_df.empty:
-        st.dataframe(numeric_df.describe())
+    if numeric_columns:
+        with st.spinner("Computing descriptive statistics..."):
+            numeric_summary = describe_numeric(df, numeric_columns)
+        st.dataframe(numeric_summary)
     else:
         st.info("No numeric columns found for descriptive statistics.")
 
     # Missing Values
     st.write("### Missing Values")
-    missing_data = df.isnull().sum()
-    missing_data = missing_data[missing_data > 0].sort_values(ascending=False)
+    missing_data = count_missing(df)
     if not missing_data.empty:
         st.dataframe(missing_data.rename("Missing Count"))
     else:
@@ -57,41 +292,39 @@ def display_statistics(df):
 
     # Categorical Analysis (New Feature)
     st.write("### Categorical Column Analysis")
-    # Also include boolean types for categorical analysis
-    categorical_columns = df.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
+    # Boolean types are included in categorical_columns by classify_columns
     if categorical_columns:
-        cat_stats = []
-        for col in categorical_columns:
-            cat_stats.append({
-                'Column': col,
-                'Unique Values': df[col].nunique(),
-                # Get the most frequent value (mode), handling potential NaNs
-                'Most Frequent Value': df[col].mode().iloc[0] if not df[col].mode().empty else 'N/A' 
-            })
-        st.dataframe(pd.DataFrame(cat_stats).set_index('Column'))
+        st.dataframe(summarize_categoricals(df, categorical_columns))
         
         # Display value counts for a selected categorical column
         st.markdown("---")
         st.subheader("Value Counts")
         cat_col = st.selectbox("Select Categorical Column for Value Counts", categorical_columns, key="stat_cat_col")
-        st.dataframe(df[cat_col].value_counts().rename("Count"))
+        st.dataframe(cached_value_counts(df, cat_col).rename("Count"))
     else:
         st.info("No categorical columns found for detailed analysis.")
 
 
-def display_visualization(df):
+@st.fragment
+def display_visualization(df, max_points=50000):
     """
     Handles data visualization based on user selection.
     Uses a fixed height of 500px for consistency.
+    Point-heavy plots are drawn from a sample of at most max_points rows.
+    Runs as a fragment, so its own widgets rerun only this function rather than the whole script.
     """
     st.header("Data Visualization")
     
     # Default plot height
     DEFAULT_HEIGHT = 500
+    # Above this many rows, scatter points are drawn with WebGL instead of SVG
+    WEBGL_ROW_THRESHOLD = 1000
+    # Correlation heatmaps larger than this many columns are drawn without per-cell text labels
+    HEATMAP_TEXT_MAX_COLUMNS = 20
+    # Above this many rows, uncolored scatter plots are rasterized server-side with datashader
+    DATASHADER_ROW_THRESHOLD = 100_000
     
-    numeric_columns = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
-    categorical_columns = df.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
-    date_columns = df.select_dtypes(include=['datetime64', 'datetime64[ns]']).columns.tolist()
+    numeric_columns, categorical_columns, date_columns = classify_columns(df)
     all_columns = df.columns.tolist()
     
     # Determine available visualizations based on data types
@@ -122,9 +355,14 @@ def display_visualization(df):
         color_col = st.selectbox("Color by (Optional Categorical)", ["None"] + categorical_columns)
         
         if color_col == "None":
-            fig = px.histogram(df, x=col, title=f"Histogram of {col}", height=DEFAULT_HEIGHT)
+            # Send only the bin counts to the browser instead of every raw value
+            counts, edges = cached_histogram(df, col)
+            fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, labels={'x': col, 'y': 'count'}, title=f"Histogram of {col}", height=DEFAULT_HEIGHT)
+            fig.update_traces(width=np.diff(edges))
+            fig.update_layout(bargap=0)
         else:
-            fig = px.histogram(df, x=col, color=color_col, title=f"Histogram of {col} grouped by {color_col}", marginal="box", height=DEFAULT_HEIGHT)
+            fig = px.histogram(x=to_plot_array(df[col]), color=to_plot_array(df[color_col]), labels={'x': col, 'color': color_col},
+                               title=f"Histogram of {col} grouped by {color_col}", marginal="box", height=DEFAULT_HEIGHT)
         st.plotly_chart(fig, use_container_width=True)
         
     elif viz_type == "Scatter Plot (Relationship)":
@@ -133,10 +371,27 @@ def display_visualization(df):
         col_y = st.selectbox("Select Y Axis", numeric_columns, index=1 if len(numeric_columns) > 1 else 0)
         color_col = st.selectbox("Color by (Optional)", ["None"] + all_columns)
         
+        raster = rasterize_scatter(df, col_x, col_y) if color_col == "None" and len(df) > DATASHADER_ROW_THRESHOLD else None
+        if raster is not None:
+            counts, x_centers, y_centers = raster
+            fig = px.imshow(np.log1p(counts), x=x_centers, y=y_centers, origin='lower', aspect='auto',
+                            labels={'x': col_x, 'y': col_y, 'color': 'log(1 + count)'},
+                            color_continuous_scale=px.colors.sequential.Inferno,
+                            title=f"Scatter Density: {col_x} vs {col_y} ({int(counts.sum()):,} points)", height=DEFAULT_HEIGHT)
+            st.plotly_chart(fig, use_container_width=True)
+            return
+        
+        # Only stratify on categorical colors; continuous colors would yield one tiny group per value
+        plot_df = prepare_plot_frame(df, max_points, color_col if color_col in categorical_columns else None)
+        render_mode = 'webgl' if len(plot_df) > WEBGL_ROW_THRESHOLD else 'svg'
+        x_arr, y_arr = to_plot_array(plot_df[col_x]), to_plot_array(plot_df[col_y])
+        
         if color_col == "None":
-            fig = px.scatter(df, x=col_x, y=col_y, title=f"Scatter Plot: {col_x} vs {col_y}", height=DEFAULT_HEIGHT)
+            fig = px.scatter(x=x_arr, y=y_arr, labels={'x': col_x, 'y': col_y},
+                             title=f"Scatter Plot: {col_x} vs {col_y}", render_mode=render_mode, height=DEFAULT_HEIGHT)
         else:
-            fig = px.scatter(df, x=col_x, y=col_y, color=color_col, title=f"Scatter Plot: {col_x} vs {col_y} by {color_col}", height=DEFAULT_HEIGHT)
+            fig = px.scatter(x=x_arr, y=y_arr, color=to_plot_array(plot_df[color_col]), labels={'x': col_x, 'y': col_y, 'color': color_col},
+                             title=f"Scatter Plot: {col_x} vs {col_y} by {color_col}", render_mode=render_mode, height=DEFAULT_HEIGHT)
         st.plotly_chart(fig, use_container_width=True)
 
     elif viz_type == "Scatter Matrix (Multivariate)":
@@ -145,10 +400,12 @@ def display_visualization(df):
         color_col = st.selectbox("Color by (Optional Categorical)", ["None"] + categorical_columns)
         
         if len(cols_to_plot) >= 2:
+            plot_df = prepare_plot_frame(df, max_points, None if color_col == "None" else color_col)
+            # px.scatter_matrix already emits a WebGL-backed Splom trace, so no render_mode switch is needed here
             if color_col == "None":
-                fig = px.scatter_matrix(df, dimensions=cols_to_plot, title="Scatter Matrix", height=DEFAULT_HEIGHT)
+                fig = px.scatter_matrix(plot_df, dimensions=cols_to_plot, title="Scatter Matrix", height=DEFAULT_HEIGHT)
             else:
-                fig = px.scatter_matrix(df, dimensions=cols_to_plot, color=color_col, title=f"Scatter Matrix colored by {color_col}", height=DEFAULT_HEIGHT)
+                fig = px.scatter_matrix(plot_df, dimensions=cols_to_plot, color=color_col, title=f"Scatter Matrix colored by {color_col}", height=DEFAULT_HEIGHT)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Please select at least two columns.")
@@ -168,17 +425,20 @@ def display_visualization(df):
         if not numeric_columns: st.warning("Requires numeric columns."); return
         col = st.selectbox("Select Numeric Column (Y-axis)", numeric_columns, key="violin_y")
         group_col = st.selectbox("Group by (Optional Categorical Column for X-axis)", ["None"] + categorical_columns, key="violin_x") 
+        # points="all" draws every row, so the violin is built from a bounded sample
+        plot_df = prepare_plot_frame(df, max_points, None if group_col == "None" else group_col)
         
         if group_col == "None":
-            fig = px.violin(df, y=col, box=True, points="all", title=f"Violin Plot of {col}", height=DEFAULT_HEIGHT)
+            fig = px.violin(plot_df, y=col, box=True, points="all", title=f"Violin Plot of {col}", height=DEFAULT_HEIGHT)
         else:
-            fig = px.violin(df, x=group_col, y=col, color=group_col, box=True, points="all", title=f"Violin Plot of {col} grouped by {group_col}", height=DEFAULT_HEIGHT)
+            fig = px.violin(plot_df, x=group_col, y=col, color=group_col, box=True, points="all", title=f"Violin Plot of {col} grouped by {group_col}", height=DEFAULT_HEIGHT)
         st.plotly_chart(fig, use_container_width=True)
 
     elif viz_type == "Count Plot (Bar Chart)":
         if not categorical_columns: st.warning("Requires categorical columns."); return
         col = st.selectbox("Select Categorical Column", categorical_columns)
-        fig = px.histogram(df, x=col, title=f"Count Plot of {col}", height=DEFAULT_HEIGHT)
+        counts = cached_value_counts(df, col)
+        fig = px.bar(x=counts.index.to_numpy(), y=counts.to_numpy(), labels={'x': col, 'y': 'count'}, title=f"Count Plot of {col}", height=DEFAULT_HEIGHT)
         st.plotly_chart(fig, use_container_width=True)
         
     elif viz_type == "Time Series Plot (Line Chart)":
@@ -187,25 +447,35 @@ def display_visualization(df):
         value_col = st.selectbox("Select Value Column (Y-axis)", numeric_columns)
         color_col = st.selectbox("Group/Color by (Optional Categorical)", ["None"] + categorical_columns)
         
-        # Ensure the date column is in datetime format before plotting
-        df_copy = df.copy()
+        # Ensure the date column is in datetime format before plotting, without copying unused columns
         try:
-            df_copy[date_col] = pd.to_datetime(df_copy[date_col], errors='coerce') 
+            ts_df = prepare_time_series_frame(df, date_col, value_col, None if color_col == "None" else color_col)
         except:
             st.error(f"Could not convert column '{date_col}' to datetime format.")
             return
 
         if color_col == "None":
-            fig = px.line(df_copy, x=date_col, y=value_col, title=f"Time Series of {value_col} over {date_col}", height=DEFAULT_HEIGHT)
+            fig = px.line(x=ts_df[date_col].to_numpy(), y=to_plot_array(ts_df[value_col]), labels={'x': date_col, 'y': value_col},
+                          title=f"Time Series of {value_col} over {date_col}", height=DEFAULT_HEIGHT)
         else:
-            fig = px.line(df_copy, x=date_col, y=value_col, color=color_col, title=f"Time Series of {value_col} over {date_col} by {color_col}", height=DEFAULT_HEIGHT)
+            fig = px.line(x=ts_df[date_col].to_numpy(), y=to_plot_array(ts_df[value_col]), color=to_plot_array(ts_df[color_col]),
+                          labels={'x': date_col, 'y': value_col, 'color': color_col},
+                          title=f"Time Series of {value_col} over {date_col} by {color_col}", height=DEFAULT_HEIGHT)
         st.plotly_chart(fig, use_container_width=True)
 
     elif viz_type == "Correlation Heatmap":
         if numeric_columns:
             st.write("### Correlation Matrix")
-            corr = df[numeric_columns].corr()
-            fig = px.imshow(corr, text_auto=True, title="Correlation Heatmap", color_continuous_scale=px.colors.sequential.Inferno, height=DEFAULT_HEIGHT)
+            with st.spinner("Computing correlation matrix..."):
+                corr = compute_correlation(df, numeric_columns)
+            corr_values = corr.to_numpy(dtype=np.float32)
+            show_text = len(numeric_columns) <= HEATMAP_TEXT_MAX_COLUMNS
+            fig = go.Figure(go.Heatmap(
+                z=corr_values, x=numeric_columns, y=numeric_columns, colorscale='Inferno',
+                text=corr_values if show_text else None, texttemplate='%{text:.2f}' if show_text else None,
+            ))
+            # Match px.imshow's matrix orientation (first column at the top)
+            fig.update_layout(title="Correlation Heatmap", height=DEFAULT_HEIGHT, yaxis_autorange='reversed')
             st.plotly_chart(fig, use_container_width=True) 
         else:
             st.warning("No numeric columns found to compute a Correlation Heatmap.")
@@ -223,11 +493,14 @@ def display_visualization(df):
             return
 
         values = None if value_col == "Count" else value_col
+        # Send one row per distinct path instead of every row
+        hierarchy_df = aggregate_hierarchy(df, path_cols, values)
+        values = values or '__count'
 
         if viz_type == "Sunburst Chart (Hierarchy)":
-            fig = px.sunburst(df, path=path_cols, values=values, title="Sunburst Chart", height=DEFAULT_HEIGHT)
+            fig = px.sunburst(hierarchy_df, path=path_cols, values=values, labels={'__count': 'count'}, title="Sunburst Chart", height=DEFAULT_HEIGHT)
         else:
-            fig = px.treemap(df, path=path_cols, values=values, title="Treemap", height=DEFAULT_HEIGHT)
+            fig = px.treemap(hierarchy_df, path=path_cols, values=values, labels={'__count': 'count'}, title="Treemap", height=DEFAULT_HEIGHT)
             
         st.plotly_chart(fig, use_container_width=True)
 
@@ -237,30 +510,34 @@ def display_visualization(df):
 def main():
     st.title("📊 Data Visualization and Exploitary Data Analysis App")
     st.markdown("""
-    Welcome! Upload your dataset (CSV or Excel) to get started.
+    Welcome! Upload your dataset (CSV, Excel or Parquet) to get started.
     This app provides a wide range of analytical and visualization tools for deep data exploration.
     """)
 
     # Sidebar for file upload
     st.sidebar.header("Upload your dataset")
-    uploaded_file = st.sidebar.file_uploader("Choose a file", type=["csv", "xlsx"])
+    uploaded_file = st.sidebar.file_uploader("Choose a file", type=["csv", "xlsx", "parquet"])
+    # The row limit only applies to Excel; keeping it out of other files' cache key avoids needless re-parses
+    excel_nrows = None
+    if uploaded_file is not None and uploaded_file.name.endswith('.xlsx'):
+        excel_nrows = st.sidebar.number_input("Max Excel rows to read (0 = all)", min_value=0, value=0, step=1000,
+                                              help="Only the first sheet of an Excel file is read.") or None
+
+    # Sidebar control for the plotting sample size
+    st.sidebar.header("Plot settings")
+    max_points = st.sidebar.slider("Max plot points", min_value=1000, max_value=200000, value=50000, step=1000,
+                                   help="Scatter, scatter matrix and violin plots sample down to this many rows.")
 
     if uploaded_file is not None:
         try:
             with st.spinner("Loading and processing data..."):
-                df = load_data(uploaded_file)
+                df, converted_columns = prepare_frame(uploaded_file, excel_nrows)
             
             st.sidebar.success("File uploaded successfully!")
             
-            # Identify and convert obvious date columns that pandas might have missed
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    try:
-                        df[col] = pd.to_datetime(df[col], errors='coerce')
-                        if df[col].notna().sum() > 0.5 * len(df):
-                            st.sidebar.info(f"Converted column '{col}' to Datetime type.")
-                    except:
-                        pass
+            # Report obvious date columns that pandas might have missed
+            for col in converted_columns:
+                st.sidebar.info(f"Converted column '{col}' to Datetime type.")
             
             # Created tabs with improved names
             tab1, tab2, tab3 = st.tabs(["📊 Data Overview", "📈 Data Statistics", "🔬 Data Visualization"])
@@ -272,12 +549,12 @@ def main():
                 display_statistics(df)
 
             with tab3:
-                display_visualization(df)
+                display_visualization(df, max_points)
 
         except Exception as e:
-            st.error(f"Error loading file. Please ensure it's a valid CSV or Excel format: {e}")
+            st.error(f"Error loading file. Please ensure it's a valid CSV, Excel or Parquet format: {e}")
     else:
-        st.info("Awaiting file upload. Please upload a CSV or Excel file from the sidebar.")
+        st.info("Awaiting file upload. Please upload a CSV, Excel or Parquet file from the sidebar.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file